@@ -1,13 +1,85 @@
 # app.py
 import os
+import re
+import hashlib
 import logging
 from datetime import datetime
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from flask.sessions import SecureCookieSessionInterface
+from flask.json.tag import TaggedJSONSerializer
+from jinja2 import FileSystemBytecodeCache
+from jinja2.ext import Extension
+
+from routes.helpers import fmt_currency
+
+try:
+    import orjson  # optional: faster session/JSON (de)serialisation
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    from flask_compress import Compress  # optional: gzip HTML responses
+except ImportError:  # pragma: no cover
+    Compress = None
+
+# -----------------------------
+# JSON provider
+# -----------------------------
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Drop-in JSON provider backed by orjson. Flask's session cookie serializer
+    goes through app.json, so the OAuth credentials blob is decoded with orjson
+    on every request. Anything orjson can't express falls back to stdlib json.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+class _OrjsonSessionSerializer(TaggedJSONSerializer):
+    """
+    Flask's tagged session format (tuples, Markup, bytes, datetimes round-trip
+    and existing cookies still decode), parsed with orjson. dumps() already
+    goes through app.json; loads() would otherwise fall back to stdlib json
+    for its object_hook, so untag the parsed tree here instead.
+    """
+
+    def loads(self, value):
+        return self._untag_tree(orjson.loads(value))
+
+    def _untag_tree(self, value):
+        # Same bottom-up order as json's object_hook
+        if isinstance(value, dict):
+            return self.untag({k: self._untag_tree(v) for k, v in value.items()})
+        if isinstance(value, list):
+            return [self._untag_tree(v) for v in value]
+        return value
+
+class OrjsonSessionInterface(SecureCookieSessionInterface):
+    serializer = _OrjsonSessionSerializer()
 
 # -----------------------------
 # Create app
 # -----------------------------
 app = Flask(__name__, static_folder="static", template_folder="templates")
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+    app.session_interface = OrjsonSessionInterface()
 
 # Secret key (required for session/OAuth)
 app.config["SECRET_KEY"] = os.environ.get("FLASK_SECRET_KEY", "dev-secret-change-me")
@@ -16,6 +88,12 @@ app.config["SECRET_KEY"] = os.environ.get("FLASK_SECRET_KEY", "dev-secret-change
 app.config["MAX_CONTENT_LENGTH"] = 32 * 1024 * 1024  # 32 MB uploads
 app.config["JSON_SORT_KEYS"] = False
 
+# Response compression (the Tailwind-heavy HTML pages compress ~10x; brotli when accepted)
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 500
+if Compress is not None:
+    Compress(app)
+
 # -----------------------------
 # Logging
 # -----------------------------
@@ -28,12 +106,6 @@ logger = logging.getLogger(__name__)
 # -----------------------------
 # Jinja helpers (optional)
 # -----------------------------
-def _fmt_currency(value):
-    try:
-        return f"£{float(value):,.2f}"
-    except Exception:
-        return value
-
 def _fmt_date(value, fmt="%Y-%m-%d"):
     if not value:
         return ""
@@ -44,9 +116,78 @@ def _fmt_date(value, fmt="%Y-%m-%d"):
     except Exception:
         return str(value)
 
-app.jinja_env.filters["currency"] = _fmt_currency
+# Any whitespace run containing a newline -> single newline (HTML-equivalent)
+_WS_RUN = re.compile(r"[ \t]*\n\s*")
+
+class _CollapseWhitespace(Extension):
+    """
+    Collapse indentation/blank lines in template source before Jinja parses it.
+    Runs once per compile, so inline render_template_string() blobs and file
+    templates both yield fewer Output nodes and smaller HTML bodies.
+    """
+
+    def preprocess(self, source, name, filename=None):
+        return _WS_RUN.sub("\n", source)
+
+app.jinja_env.add_extension(_CollapseWhitespace)
+
+# Compiled templates stay cached; skip per-render mtime checks outside development
+if os.environ.get("FLASK_ENV", "production") != "development":
+    app.config["TEMPLATES_AUTO_RELOAD"] = False
+    app.jinja_env.auto_reload = False
+# Share compiled template bytecode across gunicorn workers and restarts (tempdir by default)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.environ.get("JINJA_CACHE_DIR") or None)
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+
+app.jinja_env.filters["currency"] = fmt_currency  # same formatter as holdings rows
 app.jinja_env.filters["datefmt"] = _fmt_date
 
+# Precompiled Tailwind (see tailwind.config.js); templates fall back to the CDN JIT without it.
+# The URL carries a content hash, so browsers may cache it for good and a rebuild busts it.
+def _static_version(filename):
+    path = os.path.join(app.static_folder, filename)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as fh:
+        return hashlib.sha1(fh.read()).hexdigest()[:12]
+
+_TAILWIND_VERSION = _static_version("tailwind.css")
+_TAILWIND_CSS = f"/static/tailwind.css?v={_TAILWIND_VERSION}" if _TAILWIND_VERSION else None
+
+def _tailwind_css():
+    # Called from _tailwind.html, so only full pages that link the stylesheet get the preload
+    if _TAILWIND_CSS:
+        g.preload_tailwind = True
+    return _TAILWIND_CSS
+
+app.jinja_env.globals["tailwind_css"] = _tailwind_css
+
+# Vendored htmx (static/htmx.min.js, same content-hash URL scheme); without it the
+# portfolio page loads the pinned, integrity-checked copy from unpkg.
+_HTMX_VERSION = _static_version("htmx.min.js")
+app.jinja_env.globals["htmx_js"] = f"/static/htmx.min.js?v={_HTMX_VERSION}" if _HTMX_VERSION else None
+
+_VERSIONED_STATIC = {"/static/tailwind.css": _TAILWIND_VERSION, "/static/htmx.min.js": _HTMX_VERSION}
+
+@app.after_request
+def _preload_stylesheet(response):
+    # Let the browser start fetching the stylesheet before it parses <head>
+    if g.get("preload_tailwind") and response.status_code == 200:
+        response.headers.add("Link", f"<{_TAILWIND_CSS}>; rel=preload; as=style")
+    return response
+
+@app.after_request
+def _cache_versioned_static(response):
+    # Hashed static URLs never change content: cache them for a year, no revalidation
+    version = _VERSIONED_STATIC.get(request.path)
+    if version and request.args.get("v") == version and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
 # -----------------------------
 # Blueprints
 # NOTE:
@@ -71,7 +212,7 @@ except Exception:
     try:
         from routes.clients import bp as clients_bp
     except Exception as e:
-        logger.warning(f"clients blueprint not loaded: {e}")
+        logger.warning("clients blueprint not loaded: %s", e)
 else:
     app.register_blueprint(clients_bp)
 
@@ -82,7 +223,7 @@ except Exception:
     try:
         from routes.tasks import bp as tasks_bp
     except Exception as e:
-        logger.warning(f"tasks blueprint not loaded: {e}")
+        logger.warning("tasks blueprint not loaded: %s", e)
 else:
     app.register_blueprint(tasks_bp)
 
@@ -93,7 +234,7 @@ except Exception:
     try:
         from routes.products import bp as products_bp
     except Exception as e:
-        logger.warning(f"products blueprint not loaded: {e}")
+        logger.warning("products blueprint not loaded: %s", e)
 else:
     app.register_blueprint(products_bp)
 
@@ -104,7 +245,7 @@ except Exception:
     try:
         from routes.reviews import bp as reviews_bp
     except Exception as e:
-        logger.warning(f"reviews blueprint not loaded: {e}")
+        logger.warning("reviews blueprint not loaded: %s", e)
 else:
     app.register_blueprint(reviews_bp)
 
@@ -115,10 +256,18 @@ except Exception:
     try:
         from routes.files import bp as files_bp
     except Exception as e:
-        logger.warning(f"files blueprint not loaded: {e}")
+        logger.warning("files blueprint not loaded: %s", e)
 else:
     app.register_blueprint(files_bp)
 
+# -----------------------------
+# Template warm-up
+# Compile every page template once at worker start (into the env cache / bytecode
+# cache) so no request pays for Jinja lexing and parsing.
+# -----------------------------
+for _name in app.jinja_env.list_templates(extensions=["html"]):
+    app.jinja_env.get_template(_name)
+
 # -----------------------------
 # Health check
 # -----------------------------
@@ -142,7 +291,7 @@ def not_found(err):
 
 @app.errorhandler(500)
 def internal_error(err):
-    logger.error(f"500 error: {err}")
+    logger.error("500 error: %s", err)
     return (
         "<h1>500 - Server Error</h1><p>Something went wrong. Please try again.</p>",
         500,
@@ -0,0 +1,14 @@
+# gunicorn.conf.py
+# Picked up automatically by `gunicorn app:app` (gunicorn reads ./gunicorn.conf.py).
+#
+# Every Drive-backed view spends most of its time waiting on Google APIs, so
+# run threaded workers: while one request blocks on Drive, the same worker
+# keeps serving others. Drive clients are cached per thread, and shared
+# caches in models/google_drive.py are lock-protected.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
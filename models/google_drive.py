@@ -2,29 +2,98 @@
 
 import os
 import io
+import copy
 import json
+import time
 import logging
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest, MediaIoBaseUpload, MediaIoBaseDownload, build_http
 from google.oauth2.credentials import Credentials
 
 from docx import Document
 from docx.shared import Pt
 
-__all__ = ["SimpleGoogleDrive"]
+__all__ = ["SimpleGoogleDrive", "ClientRecord", "drive_for_session", "DRIVE_RETRIES"]
 
 logger = logging.getLogger(__name__)
 
+# Retries for 429/5xx and connection errors; googleapiclient backs off exponentially (with jitter)
+DRIVE_RETRIES = 4
+
+# Suffix for generated task ids: second-resolution stamps collide under concurrent adds
+_TASK_SEQ = itertools.count()
+
+# Shared worker pool for independent Drive round trips (I/O bound).
+_DRIVE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="drive-io")
+
+# Short-lived cache of discovered clients: (root, user) -> (stamp, clients, by_id, changes token)
+_CLIENTS_CACHE_TTL = 30.0
+# Past the TTL (but within this window) the old index is served while a pool worker rebuilds it
+_CLIENTS_CACHE_STALE = 600.0
+_clients_cache: Dict[tuple, tuple] = {}
+_clients_cache_lock = threading.Lock()
+_clients_refreshing: set = set()
+
+# Keep combined "'a' in parents or 'b' in parents ..." queries well under Drive's query length limit
+_PARENTS_PER_QUERY = 40
+# Drive accepts at most 100 calls per batch request
+_BATCH_LIMIT = 100
+
+# Cross-request LRU of ensured folder ids: (root, user, parent_id, name) -> (stamp, id).
+# Entries expire so folders trashed or moved in the Drive UI are eventually re-resolved.
+_FOLDER_IDS_MAX = 2048
+_FOLDER_IDS_TTL = 600.0
+_folder_ids: "OrderedDict[tuple, tuple]" = OrderedDict()
+_folder_ids_lock = threading.Lock()
+# Striped locks so concurrent ensures of the same (parent, name) share one lookup/create
+_ensure_locks = [threading.Lock() for _ in range(64)]
+
+# Per-thread LRU of Drive clients keyed by session identity (see drive_for_session)
+_DRIVES_PER_THREAD = 16
+_thread_drives = threading.local()
+
 
 # -----------------------------
 # Helpers
 # -----------------------------
+def _connection_pool():
+    """
+    This thread's httplib2.Http (googleapiclient's default timeout). Every Drive
+    client used on the thread authorizes through it, so all sessions share its
+    kept-alive googleapis.com connection instead of each paying a TLS handshake.
+    """
+    http = getattr(_thread_drives, "http", None)
+    if http is None:
+        http = _thread_drives.http = build_http()
+    return http
+
+
+_DRIVE_DISCOVERY: Optional[Dict] = None
+
+
 def _build_drive_service(credentials: Credentials):
-    """Build Google Drive v3 service with discovery cache disabled (lower memory)."""
-    return build("drive", "v3", credentials=credentials, cache_discovery=False)
+    """
+    Build a Google Drive v3 service from the library's bundled discovery document,
+    read and parsed once per process (build() re-reads the file for every client).
+    Each service gets its own copy: the client library fills in the resource
+    descriptions it is handed in place the first time a resource is used.
+    """
+    global _DRIVE_DISCOVERY
+    if _DRIVE_DISCOVERY is None:
+        _DRIVE_DISCOVERY = json.loads(get_static_doc("drive", "v3"))
+    http = AuthorizedHttp(credentials, http=_connection_pool())
+    return build_from_document(copy.deepcopy(_DRIVE_DISCOVERY), http=http)
 
 
 def _safe_date(date_str: str) -> Optional[datetime]:
@@ -36,10 +105,57 @@ def _safe_date(date_str: str) -> Optional[datetime]:
 
 def _escape_drive_name(value: str) -> str:
     """
-    Make a name safe for a Drive v3 query single-quoted string.
-    Replace ASCII apostrophe ' with typographic ’ so we avoid backslash escaping.
+    Make a name safe for a Drive v3 query single-quoted string: backslash-escape
+    backslashes and apostrophes so names like "O'Neil" match exactly.
     """
-    return (value or "").replace("'", "’")
+    return (value or "").replace("\\", "\\\\").replace("'", "\\'")
+
+
+# Drive query templates; only the parent id and (escaped) name vary per call
+_FOLDER_Q = "'{parent}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
+_NAMED_FOLDER_Q = _FOLDER_Q + " and name='{name}'"
+_NAMED_FILE_Q = "'{parent}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false and name='{name}'"
+
+
+# Subfolders whose presence marks a folder as a client
+_CLIENT_MARKERS = {"Tasks", "Reviews", "Products"}
+
+
+def _is_letter_folder(folder: Dict) -> bool:
+    """A–Z index folder: a single uppercase letter."""
+    nm = (folder.get("name") or "").strip()
+    return len(nm) == 1 and nm.isalpha() and nm.upper() == nm
+
+
+# Badge classes and display labels per client status, resolved once per record
+# (no per-row lower()/replace()/title() or class ladders in templates)
+_STATUS_META = {
+    "active": ("bg-green-100 text-green-800", "Active"),
+    "deceased": ("bg-gray-100 text-gray-800", "Deceased"),
+    "no_longer_client": ("bg-red-100 text-red-800", "No Longer Client"),
+    "archived": ("bg-gray-100 text-gray-800", "Archived"),
+    "prospect": ("bg-yellow-100 text-yellow-800", "Prospect"),
+}
+# Badge for statuses missing from _STATUS_META (shown with their own title-cased label)
+_NEUTRAL_BADGE = "bg-gray-100 text-gray-800"
+
+
+_DRIVE_FOLDER_URL = "https://drive.google.com/drive/folders/"
+
+
+def _status_meta(status: str) -> Tuple[str, str]:
+    """(badge class, label) for a status; unknown values keep their own name on a neutral badge."""
+    status = (status or "active").lower()
+    meta = _STATUS_META.get(status)
+    if meta is None:
+        meta = (_NEUTRAL_BADGE, status.replace("_", " ").title())
+    return meta
+
+
+def _log_background_failure(fut):
+    exc = fut.exception()
+    if exc is not None:
+        logger.warning("Background Drive task failed: %s", exc)
 
 
 def _float_safe(x) -> float:
@@ -49,6 +165,51 @@ def _float_safe(x) -> float:
         return 0.0
 
 
+@dataclass
+class ClientRecord:
+    """
+    One client folder as returned by get_clients_enhanced().
+    Slotted, so templates resolve `client.display_name` with a plain attribute
+    load; `record["key"]` / `record.get("key")` keep dict-style callers working.
+    """
+
+    __slots__ = ("client_id", "display_name", "status", "status_class", "status_label", "folder_id", "folder_url",
+                 "portfolio_value")
+
+    client_id: str
+    display_name: str
+    status: str
+    status_class: str
+    status_label: str
+    folder_id: str
+    folder_url: str
+    portfolio_value: float
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+
+def _client_record(folder: Dict) -> ClientRecord:
+    """ClientRecord for a client folder ({id, name} from Drive)."""
+    status_class, status_label = _status_meta("active")
+    return ClientRecord(
+        client_id=folder["id"],
+        display_name=(folder.get("name") or "").strip(),
+        status="active",
+        status_class=status_class,
+        status_label=status_label,
+        folder_id=folder["id"],
+        folder_url=_DRIVE_FOLDER_URL + folder["id"],
+        portfolio_value=0.0,  # legacy field; AUM now derived from Products
+    )
+
+
 class SimpleGoogleDrive:
     """
     Google Drive helper for WealthPro CRM.
@@ -93,77 +254,238 @@ class SimpleGoogleDrive:
     """
 
     def __init__(self, credentials: Credentials):
+        self.credentials = credentials
         self.drive = _build_drive_service(credentials)
         self.root_folder_id = os.environ.get("GDRIVE_ROOT_FOLDER_ID", "").strip()
         if not self.root_folder_id:
             raise RuntimeError("GDRIVE_ROOT_FOLDER_ID is not set. Please set it in Render env vars.")
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local()
+        self._lookups: Dict[tuple, object] = {}
         logger.info("Google Drive ready.")
 
+    def begin_request(self) -> None:
+        """Start a fresh request scope for the folder lookup memo (see _find_child_folder)."""
+        self._lookups = {}
+
     # -----------------------------
     # Low-level Drive ops
     # -----------------------------
+    def _execute(self, request):
+        """
+        Execute a Drive request, retrying rate limits and transient errors.
+        httplib2 connections are not thread-safe, so calls made from
+        _DRIVE_POOL workers get their own authorized transport.
+        """
+        kwargs = {}
+        http = self._thread_http()
+        if http is not None:
+            kwargs["http"] = http
+        if not isinstance(request, BatchHttpRequest):  # batches only retry auth failures
+            kwargs["num_retries"] = DRIVE_RETRIES
+        return request.execute(**kwargs)
+
+    def _thread_http(self) -> Optional[AuthorizedHttp]:
+        """Per-thread authorized transport for pool workers; None on the owner thread."""
+        if threading.get_ident() == self._owner_thread:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=_connection_pool())
+        return http
+
     def _list_folders(self, parent_id: str) -> List[Dict]:
-        """List non-trashed folders directly under parent."""
+        """List non-trashed folders directly under parent (memoised for the current request)."""
+        key = ("list", parent_id)
+        if key in self._lookups:
+            return list(self._lookups[key])
         folders: List[Dict] = []
         page_token = None
-        query = (
-            f"'{parent_id}' in parents and "
-            "mimeType='application/vnd.google-apps.folder' and trashed=false"
-        )
+        query = _FOLDER_Q.format(parent=parent_id)
         while True:
-            resp = self.drive.files().list(
+            resp = self._execute(self.drive.files().list(
                 q=query,
                 fields="nextPageToken, files(id, name)",
                 pageToken=page_token,
                 pageSize=1000,
-            ).execute()
+            ))
             folders.extend(resp.get("files", []))
             page_token = resp.get("nextPageToken")
             if not page_token:
                 break
+        self._lookups[key] = folders
+        return list(folders)
+
+    def _list_folders_under(self, parent_ids: List[str], name: Optional[str] = None,
+                            fields: str = "id, name, parents") -> List[Dict]:
+        """
+        List non-trashed folders (optionally only those called `name`) under any of
+        `parent_ids` with one combined query per _PARENTS_PER_QUERY parents, instead
+        of one list call per parent. `fields` includes `parents` by default for
+        grouping; callers that don't group can ask for less.
+        """
+        folders: List[Dict] = []
+        name_clause = f" and name='{_escape_drive_name(name)}'" if name is not None else ""
+        for i in range(0, len(parent_ids), _PARENTS_PER_QUERY):
+            chunk = parent_ids[i:i + _PARENTS_PER_QUERY]
+            parents = " or ".join(f"'{pid}' in parents" for pid in chunk)
+            query = f"({parents}) and mimeType='application/vnd.google-apps.folder' and trashed=false{name_clause}"
+            page_token = None
+            while True:
+                resp = self._execute(self.drive.files().list(
+                    q=query,
+                    fields=f"nextPageToken, files({fields})",
+                    pageToken=page_token,
+                    pageSize=1000,
+                ))
+                folders.extend(resp.get("files", []))
+                page_token = resp.get("nextPageToken")
+                if not page_token:
+                    break
         return folders
 
+    def _list_files_under(self, parent_ids: List[str], fields: str) -> List[Dict]:
+        """Non-folder files under any of `parent_ids` (combined queries; `fields` names the file fields)."""
+        files: List[Dict] = []
+        for i in range(0, len(parent_ids), _PARENTS_PER_QUERY):
+            chunk = parent_ids[i:i + _PARENTS_PER_QUERY]
+            parents = " or ".join(f"'{pid}' in parents" for pid in chunk)
+            query = f"({parents}) and mimeType!='application/vnd.google-apps.folder' and trashed=false"
+            page_token = None
+            while True:
+                resp = self._execute(self.drive.files().list(
+                    q=query,
+                    fields=f"nextPageToken, files({fields})",
+                    pageToken=page_token,
+                    pageSize=1000,
+                ))
+                files.extend(resp.get("files", []))
+                page_token = resp.get("nextPageToken")
+                if not page_token:
+                    break
+        return files
+
+    def _execute_batch(self, requests: List) -> List:
+        """
+        Execute independent Drive requests as batch calls (up to _BATCH_LIMIT each)
+        and return their responses in input order. Raises the first sub-request error.
+        """
+        results: List = [None] * len(requests)
+        errors: List[Exception] = []
+
+        def on_done(request_id, response, exception):
+            if exception is not None:
+                errors.append(exception)
+            else:
+                results[int(request_id)] = response
+
+        for i in range(0, len(requests), _BATCH_LIMIT):
+            batch = self.drive.new_batch_http_request(callback=on_done)
+            for j, req in enumerate(requests[i:i + _BATCH_LIMIT], start=i):
+                batch.add(req, request_id=str(j))
+            self._execute(batch)
+        if errors:
+            raise errors[0]
+        return results
+
     def _find_child_folder(self, parent_id: str, name: str) -> Optional[Dict]:
-        """Find a folder named `name` directly under `parent_id`."""
-        safe_name = _escape_drive_name(name)
-        query = (
-            f"'{parent_id}' in parents and "
-            "mimeType='application/vnd.google-apps.folder' and "
-            f"name='{safe_name}' and trashed=false"
-        )
-        resp = self.drive.files().list(q=query, fields="files(id, name)", pageSize=1).execute()
+        """Find a folder named `name` directly under `parent_id` (memoised for the current request)."""
+        key = ("child", parent_id, name)
+        if key in self._lookups:
+            return self._lookups[key]
+        query = _NAMED_FOLDER_Q.format(parent=parent_id, name=_escape_drive_name(name))
+        resp = self._execute(self.drive.files().list(q=query, fields="files(id, name)", pageSize=1))
         files = resp.get("files", [])
-        return files[0] if files else None
+        found = self._lookups[key] = files[0] if files else None
+        return found
+
+    def _remember_folder(self, parent_id: str, folder: Dict) -> None:
+        """Record a folder we just created so later lookups in this request see it."""
+        self._lookups[("child", parent_id, folder["name"])] = folder
+        self._lookups.pop(("list", parent_id), None)
+        self._cache_folder_id(parent_id, folder["name"], folder["id"])
+
+    def _cached_folder_id(self, parent_id: str, name: str) -> Optional[str]:
+        key = self._clients_cache_key() + (parent_id, name)
+        with _folder_ids_lock:
+            entry = _folder_ids.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= _FOLDER_IDS_TTL:
+                del _folder_ids[key]
+                return None
+            _folder_ids.move_to_end(key)
+            return entry[1]
+
+    def _cache_folder_id(self, parent_id: str, name: str, folder_id: str) -> None:
+        key = self._clients_cache_key() + (parent_id, name)
+        with _folder_ids_lock:
+            _folder_ids[key] = (time.monotonic(), folder_id)
+            _folder_ids.move_to_end(key)
+            while len(_folder_ids) > _FOLDER_IDS_MAX:
+                _folder_ids.popitem(last=False)
+
+    def _forget_folder_ids(self) -> None:
+        """Drop this Drive's cached folder ids (and request memos) after a structural change."""
+        self._lookups.clear()
+        scope = self._clients_cache_key()
+        with _folder_ids_lock:
+            for key in [k for k in _folder_ids if k[:2] == scope]:
+                del _folder_ids[key]
 
     def _ensure_folder(self, parent_id: str, name: str) -> str:
-        """Get or create a child folder."""
-        existing = self._find_child_folder(parent_id, name)
-        if existing:
-            return existing["id"]
-        body = {
-            "name": name,
-            "mimeType": "application/vnd.google-apps.folder",
-            "parents": [parent_id],
-        }
-        created = self.drive.files().create(body=body, fields="id,name").execute()
-        return created["id"]
+        """Get or create a child folder (ids are remembered across requests)."""
+        cached = self._cached_folder_id(parent_id, name)
+        if cached:
+            return cached
+        # Single-flight: a concurrent caller for the same folder waits and reuses our result
+        # instead of racing us to create a duplicate.
+        with _ensure_locks[hash((parent_id, name)) % len(_ensure_locks)]:
+            cached = self._cached_folder_id(parent_id, name)
+            if cached:
+                return cached
+            existing = self._find_child_folder(parent_id, name)
+            if existing:
+                self._cache_folder_id(parent_id, name, existing["id"])
+                return existing["id"]
+            body = {
+                "name": name,
+                "mimeType": "application/vnd.google-apps.folder",
+                "parents": [parent_id],
+            }
+            created = self._execute(self.drive.files().create(body=body, fields="id,name"))
+            self._remember_folder(parent_id, created)
+            return created["id"]
+
+    def _create_folders_batch(self, parent_id: str, names: List[str]) -> Dict[str, str]:
+        """Create sibling folders in one batched HTTP round trip; returns name -> id."""
+        requests = [
+            self.drive.files().create(
+                body={
+                    "name": name,
+                    "mimeType": "application/vnd.google-apps.folder",
+                    "parents": [parent_id],
+                },
+                fields="id,name",
+            )
+            for name in names
+        ]
+        created = self._execute_batch(requests)
+        for folder in created:
+            self._remember_folder(parent_id, folder)
+        return {f["name"]: f["id"] for f in created}
 
     def _upload_bytes(self, parent_id: str, filename: str, data: bytes, mime: str) -> str:
         media = MediaIoBaseUpload(io.BytesIO(data), mimetype=mime, resumable=False)
         body = {"name": filename, "parents": [parent_id]}
-        created = self.drive.files().create(body=body, media_body=media, fields="id").execute()
+        created = self._execute(self.drive.files().create(body=body, media_body=media, fields="id"))
         return created["id"]
 
     def _find_child_file(self, parent_id: str, name: str) -> Optional[Dict]:
-        safe_name = _escape_drive_name(name)
-        q = (
-            f"'{parent_id}' in parents and trashed=false and "
-            "mimeType!='application/vnd.google-apps.folder' and "
-            f"name='{safe_name}'"
-        )
-        resp = self.drive.files().list(
-            q=q, fields="files(id,name,mimeType,parents)", pageSize=1
-        ).execute()
+        q = _NAMED_FILE_Q.format(parent=parent_id, name=_escape_drive_name(name))
+        resp = self._execute(self.drive.files().list(
+            q=q, fields="files(id)", pageSize=1
+        ))
         files = resp.get("files", [])
         return files[0] if files else None
 
@@ -172,64 +494,88 @@ class SimpleGoogleDrive:
         existing = self._find_child_file(parent_id, filename)
         media = MediaIoBaseUpload(io.BytesIO(data), mimetype=mime, resumable=False)
         if existing:
-            self.drive.files().update(
+            self._execute(self.drive.files().update(
                 fileId=existing["id"], media_body=media, fields="id"
-            ).execute()
+            ))
             return existing["id"]
         return self._upload_bytes(parent_id, filename, data, mime)
 
     def _read_file_bytes(self, file_id: str) -> bytes:
         request = self.drive.files().get_media(fileId=file_id)
+        http = self._thread_http()
+        if http is not None:
+            request.http = http
         fh = io.BytesIO()
         downloader = MediaIoBaseDownload(fd=fh, request=request)
         done = False
         while not done:
-            status, done = downloader.next_chunk()
+            status, done = downloader.next_chunk(num_retries=DRIVE_RETRIES)
         fh.seek(0)
         return fh.read()
 
     def _trash_file_or_folder(self, file_id: str):
         """Safer than hard delete; sends to Drive trash."""
+        self._forget_folder_ids()
         try:
-            self.drive.files().update(fileId=file_id, body={"trashed": True}).execute()
+            self._execute(self.drive.files().update(fileId=file_id, body={"trashed": True}, fields="id"))
         except Exception as e:
-            logger.warning(f"Failed to trash {file_id}: {e}")
+            logger.warning("Failed to trash %s: %s", file_id, e)
 
-    def _move_file(self, file_id: str, new_parent_id: str):
-        file = self.drive.files().get(fileId=file_id, fields="parents").execute()
-        prev = ",".join(file.get("parents", [])) if file.get("parents") else ""
-        self.drive.files().update(
-            fileId=file_id, addParents=new_parent_id, removeParents=prev, fields="id,parents"
-        ).execute()
+    def _move_file(self, file_id: str, new_parent_id: str, current_parents: Optional[List[str]] = None,
+                   new_name: Optional[str] = None):
+        """
+        Move a file (optionally renaming it in the same update). Pass `current_parents`
+        when the caller already has them to skip the lookup round trip.
+        """
+        self._forget_folder_ids()
+        if current_parents is None:
+            file = self._execute(self.drive.files().get(fileId=file_id, fields="parents"))
+            current_parents = file.get("parents") or []
+        body = {"name": new_name} if new_name else None
+        self._execute(self.drive.files().update(
+            fileId=file_id, body=body, addParents=new_parent_id,
+            removeParents=",".join(current_parents), fields="id"
+        ))
 
     def _rename_file(self, file_id: str, new_name: str):
-        self.drive.files().update(fileId=file_id, body={"name": new_name}, fields="id,name").execute()
+        self._forget_folder_ids()
+        self._execute(self.drive.files().update(fileId=file_id, body={"name": new_name}, fields="id"))
+
+    def get_changes_token(self) -> str:
+        """Drive Changes API start token; it advances whenever anything in the Drive changes."""
+        resp = self._execute(self.drive.changes().getStartPageToken(fields="startPageToken"))
+        return resp.get("startPageToken", "")
 
     # -----------------------------
     # Folder discovery helpers
     # -----------------------------
     def _get_letter_folders(self, parent_id: str) -> List[Dict]:
         """Return A–Z (single uppercase letter) folders under parent."""
-        out = []
-        for f in self._list_folders(parent_id):
-            nm = (f.get("name") or "").strip()
-            if len(nm) == 1 and nm.isalpha() and nm.upper() == nm:
-                out.append(f)
-        return out
+        return [f for f in self._list_folders(parent_id) if _is_letter_folder(f)]
+
+    def _child_folders_by_parent(self, parent_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Child folders of several parents from combined queries, grouped by parent id."""
+        grouped: Dict[str, List[Dict]] = {pid: [] for pid in parent_ids}
+        for f in self._list_folders_under(parent_ids):
+            for pid in f.get("parents") or []:
+                if pid in grouped:
+                    grouped[pid].append(f)
+        return grouped
+
+    def _remove_legacy_communications(self, client_ids: List[str]):
+        """
+        Trash legacy 'Communications' folders under the given clients. One targeted
+        name query per _PARENTS_PER_QUERY clients finds them, instead of listing
+        every client's subfolders.
+        """
+        for f in self._list_folders_under(client_ids, "Communications", fields="id"):
+            self._trash_file_or_folder(f["id"])
 
-    def _has_client_markers(self, folder_id: str) -> bool:
-        """Heuristic: treat a folder as a client if it contains key subfolders."""
-        for f in self._list_folders(folder_id):
-            nm = (f.get("name") or "").strip()
-            if nm in {"Tasks", "Reviews", "Products"}:
-                return True
-        return False
-
-    def _remove_legacy_communications(self, client_id: str):
-        """Trash a legacy 'Communications' folder if present under client."""
-        for f in self._list_folders(client_id):
-            if (f.get("name") or "").strip() == "Communications":
-                self._trash_file_or_folder(f["id"])
+    def _remove_legacy_communications_async(self, client_ids: List[str]):
+        """Queue legacy Communications cleanup on the worker pool; callers don't wait."""
+        if client_ids:
+            fut = _DRIVE_POOL.submit(self._remove_legacy_communications, client_ids)
+            fut.add_done_callback(_log_background_failure)
 
     # -----------------------------
     # Client creation & listing
@@ -251,9 +597,12 @@ class SimpleGoogleDrive:
         if root_letters:
             parent_for_letters = self.root_folder_id
         else:
-            # Find a category (e.g., "Active Clients") that contains A–Z
-            for cat in self._list_folders(self.root_folder_id):
-                if self._get_letter_folders(cat["id"]):
+            # Find a category (e.g., "Active Clients") that contains A–Z;
+            # all categories' children come back from one combined listing
+            categories = self._list_folders(self.root_folder_id)
+            children = self._child_folders_by_parent([c["id"] for c in categories])
+            for cat in categories:
+                if any(_is_letter_folder(k) for k in children[cat["id"]]):
                     parent_for_letters = cat["id"]
                     break
             if parent_for_letters is None:
@@ -265,63 +614,209 @@ class SimpleGoogleDrive:
 
         client_id = self._ensure_folder(index_id, display_name)
 
-        # Core structure
-        tasks_id = self._ensure_folder(client_id, "Tasks")
-        self._ensure_folder(tasks_id, "Ongoing Tasks")
-        self._ensure_folder(tasks_id, "Completed Tasks")
-        self._ensure_folder(client_id, "Reviews")
-        self._ensure_folder(client_id, "Products")  # NEW: always present
+        # Core structure: one listing, then a single batched create for what's missing
+        children = self._list_folders(client_id)
+        existing = {(f.get("name") or "").strip(): f["id"] for f in children}
+        missing = [n for n in ("Tasks", "Reviews", "Products") if n not in existing]  # Products: always present
+        if missing:
+            existing.update(self._create_folders_batch(client_id, missing))
+
+        tasks_id = existing["Tasks"]
+        task_children = set() if "Tasks" in missing else {f.get("name") for f in self._list_folders(tasks_id)}
+        task_missing = [n for n in ("Ongoing Tasks", "Completed Tasks") if n not in task_children]
+        if task_missing:
+            self._create_folders_batch(tasks_id, task_missing)
 
         # Remove any old Communications folder safely
-        self._remove_legacy_communications(client_id)
+        for f in children:
+            if (f.get("name") or "").strip() == "Communications":
+                self._trash_file_or_folder(f["id"])
+
+        if _is_letter_folder({"name": index_letter}):
+            self._add_to_client_index(_client_record({"id": client_id, "name": display_name}))
+        else:
+            self.invalidate_clients_cache()  # "#" folders aren't discovered; let the index rebuild
 
         logger.info("Created enhanced client folder for %s", display_name)
         return client_id
 
-    def get_clients_enhanced(self) -> List[Dict]:
+    def _clients_cache_key(self) -> tuple:
+        creds = self.credentials
+        return (self.root_folder_id, getattr(creds, "refresh_token", None) or getattr(creds, "token", None))
+
+    def invalidate_clients_cache(self) -> None:
+        with _clients_cache_lock:
+            _clients_cache.pop(self._clients_cache_key(), None)
+
+    def _add_to_client_index(self, record: ClientRecord) -> None:
+        """Insert a just-created client into the cached index (if any) rather than rediscovering."""
+        key = self._clients_cache_key()
+        with _clients_cache_lock:
+            entry = _clients_cache.get(key)
+            if entry is None or record.client_id in entry[2]:
+                return
+            clients = sorted(entry[1] + [record], key=lambda c: c.display_name.lower())
+            _clients_cache[key] = (entry[0], clients, dict(entry[2], **{record.client_id: record}), entry[3])
+
+    def _cached_client_index(self) -> Optional[Tuple[List[ClientRecord], Dict[str, ClientRecord]]]:
+        """The cached (clients, by_id) pair if still fresh, else None; never hits Drive."""
+        with _clients_cache_lock:
+            entry = _clients_cache.get(self._clients_cache_key())
+        if entry and time.monotonic() - entry[0] < _CLIENTS_CACHE_TTL:
+            return entry[1], entry[2]
+        return None
+
+    def _client_index(self) -> Tuple[List[ClientRecord], Dict[str, ClientRecord]]:
+        """
+        Discovered clients plus an id index, reused for _CLIENTS_CACHE_TTL seconds.
+        An expired (but not too old) index is returned as-is and rebuilt in the
+        background, so only a cold cache makes the request wait on discovery.
+        """
+        key = self._clients_cache_key()
+        with _clients_cache_lock:
+            entry = _clients_cache.get(key)
+            age = time.monotonic() - entry[0] if entry else None
+            if age is not None and age < _CLIENTS_CACHE_TTL:
+                return entry[1], entry[2]
+            if age is not None and age < _CLIENTS_CACHE_STALE:
+                if key not in _clients_refreshing:
+                    _clients_refreshing.add(key)
+                    _DRIVE_POOL.submit(self._refresh_client_index, key)
+                return entry[1], entry[2]
+        return self._rebuild_client_index(key)
+
+    def _rebuild_client_index(self, key: tuple) -> Tuple[List[ClientRecord], Dict[str, ClientRecord]]:
+        """
+        Rediscover clients, unless the Drive changes token still matches the one
+        the cached index was built at: then nothing moved and the index is just
+        re-stamped (one getStartPageToken call instead of a full discovery).
+        """
+        now = time.monotonic()
+        token = self.get_changes_token()
+        with _clients_cache_lock:
+            entry = _clients_cache.get(key)
+        if entry is not None and token and entry[3] == token:
+            clients, by_id = entry[1], entry[2]
+        else:
+            clients = self._discover_clients()
+            by_id = {c.client_id: c for c in clients}
+        with _clients_cache_lock:
+            for k in [k for k, e in _clients_cache.items() if now - e[0] >= _CLIENTS_CACHE_STALE]:
+                del _clients_cache[k]
+            _clients_cache[key] = (now, clients, by_id, token)
+        return clients, by_id
+
+    def _refresh_client_index(self, key: tuple) -> None:
+        """Background rebuild for _client_index; failures just leave the old index in place."""
+        try:
+            self._rebuild_client_index(key)
+        except Exception:
+            logger.exception("Background client index refresh failed")
+        finally:
+            with _clients_cache_lock:
+                _clients_refreshing.discard(key)
+
+    def get_clients_enhanced(self) -> List[ClientRecord]:
+        """All client folders, sorted by name (cached briefly; see _client_index)."""
+        return list(self._client_index()[0])
+
+    def get_client_by_id(self, client_id: str) -> Optional[ClientRecord]:
+        """
+        Single client by folder id: O(1) from the cached index when it's warm.
+        When it's cold, a folder filed under an A–Z letter of this CRM root is
+        confirmed with a few files.get calls; anything else is left to full
+        discovery, so the answer never depends on the cache state.
+        """
+        cached = self._cached_client_index()
+        if cached is not None:
+            return cached[1].get(client_id)
+        if not client_id or client_id == self.root_folder_id:
+            return None
+        folder = self._get_folder_meta(client_id)
+        if folder is None:
+            return None
+        if self._in_letter_index(folder):
+            return _client_record(folder)
+        return self._client_index()[1].get(client_id)
+
+    def _get_folder_meta(self, folder_id: str) -> Optional[Dict]:
+        """id/name/parents of a live folder, or None if it's missing, trashed or not a folder."""
+        try:
+            folder = self._execute(self.drive.files().get(
+                fileId=folder_id, fields="id,name,mimeType,trashed,parents"
+            ))
+        except HttpError as e:
+            if e.resp.status == 404:
+                return None
+            raise
+        if folder.get("trashed") or folder.get("mimeType") != "application/vnd.google-apps.folder":
+            return None
+        return folder
+
+    def _in_letter_index(self, folder: Dict) -> bool:
+        """
+        True only where _discover_clients would list the folder too: its parent is
+        a letter folder directly under ROOT, or a letter under a category under a
+        ROOT that has no letters of its own.
+        """
+        parents = folder.get("parents") or []
+        if len(parents) != 1:
+            return False
+        letter = self._get_folder_meta(parents[0])
+        if letter is None or not _is_letter_folder(letter):
+            return False
+        above = letter.get("parents") or []
+        if self.root_folder_id in above:
+            return True
+        if len(above) != 1:
+            return False
+        category = self._get_folder_meta(above[0])
+        return (
+            category is not None
+            and not _is_letter_folder(category)
+            and self.root_folder_id in (category.get("parents") or [])
+            and not self._get_letter_folders(self.root_folder_id)
+        )
+
+    def _discover_clients(self) -> List[ClientRecord]:
         """
         Discover client folders robustly for both supported layouts:
         - Letters directly under ROOT
         - Category folders under ROOT, then letters
         Skips category and letter folders themselves; only returns leaf client folders.
         """
-        clients: List[Dict] = []
+        clients: List[ClientRecord] = []
 
         def add_client(folder: Dict):
-            clients.append(
-                {
-                    "client_id": folder["id"],
-                    "display_name": (folder.get("name") or "").strip(),
-                    "status": "active",
-                    "folder_id": folder["id"],
-                    "portfolio_value": 0.0,  # legacy field; AUM now derived from Products
-                }
-            )
+            clients.append(_client_record(folder))
 
         # Case 1: letters directly under ROOT
         root_letters = self._get_letter_folders(self.root_folder_id)
         if root_letters:
-            for letter in root_letters:
-                for child in self._list_folders(letter["id"]):
-                    add_client(child)
-                    # also clean any leftover comms silently
-                    self._remove_legacy_communications(child["id"])
+            for child in self._list_folders_under([letter["id"] for letter in root_letters], fields="id, name"):
+                add_client(child)
         else:
             # Case 2: categories under ROOT -> letters -> clients
-            for category in self._list_folders(self.root_folder_id):
-                letters = self._get_letter_folders(category["id"])
+            # (every category's children come from one combined listing)
+            categories = self._list_folders(self.root_folder_id)
+            children = self._child_folders_by_parent([c["id"] for c in categories])
+            letter_ids: List[str] = []
+            for category in categories:
+                kids = children[category["id"]]
+                letters = [k for k in kids if _is_letter_folder(k)]
                 if letters:
-                    for letter in letters:
-                        for child in self._list_folders(letter["id"]):
-                            add_client(child)
-                            self._remove_legacy_communications(child["id"])
+                    letter_ids.extend(letter["id"] for letter in letters)
                 else:
-                    # category may hold clients directly
-                    if self._has_client_markers(category["id"]):
+                    # category may hold clients directly (heuristic: it has key subfolders)
+                    if any((k.get("name") or "").strip() in _CLIENT_MARKERS for k in kids):
                         add_client(category)
-                        self._remove_legacy_communications(category["id"])
+            for child in self._list_folders_under(letter_ids, fields="id, name"):
+                add_client(child)
 
-        clients.sort(key=lambda c: (c["display_name"] or "").lower())
+        # also clean any leftover comms silently, off the request path
+        self._remove_legacy_communications_async([c.client_id for c in clients])
+
+        clients.sort(key=lambda c: c.display_name.lower())
         return clients
 
     # -----------------------------
@@ -345,7 +840,7 @@ class SimpleGoogleDrive:
         pr = task.get("priority", "Medium")
         ttype = task.get("task_type", "")
         title = (task.get("title") or "").strip()
-        tid = task.get("task_id", f"TSK{datetime.now().strftime('%Y%m%d%H%M%S')}")
+        tid = task.get("task_id") or f"TSK{datetime.now():%Y%m%d%H%M%S}{next(_TASK_SEQ) % 10000:04d}"
 
         filename = f"{due} - {pr} - {ttype} - {title} [{tid}].txt"
 
@@ -373,36 +868,37 @@ class SimpleGoogleDrive:
 
     def complete_task(self, task_file_id: str) -> bool:
         """Move the task file to Completed Tasks and prefix with 'COMPLETED - '."""
-        file = self.drive.files().get(fileId=task_file_id, fields="id,name,parents").execute()
+        file = self._execute(self.drive.files().get(fileId=task_file_id, fields="id,name,parents"))
         if not file:
             return False
 
-        # climb up to find Tasks -> client
+        # climb up to the client's Tasks folder; stop as soon as it's identified
+        # (a task normally sits in Ongoing Tasks, whose parent *is* Tasks: one hop)
         parent = (file.get("parents") or [None])[0]
-        client_id = None
+        tasks_id = None
 
         hops = 0
         while parent and hops < 5:
-            node = self.drive.files().get(fileId=parent, fields="id,name,parents").execute()
+            node = self._execute(self.drive.files().get(fileId=parent, fields="name,parents"))
             name = node.get("name") or ""
             if name == "Tasks":
-                par = node.get("parents") or []
-                client_id = par[0] if par else None
+                tasks_id = parent
                 break
             parent = (node.get("parents") or [None])[0]
+            if name in ("Ongoing Tasks", "Completed Tasks"):
+                tasks_id = parent
+                break
             hops += 1
 
-        if not client_id:
+        if not tasks_id:
             return False
 
-        fids = self._get_client_tasks_folder_ids(client_id)
-        completed = fids["completed"]
-
-        self._move_file(task_file_id, completed)
+        completed = self._ensure_folder(tasks_id, "Completed Tasks")
 
+        # Move + rename in one update, reusing the parents fetched above
         current_name = file.get("name", "")
-        if not current_name.startswith("COMPLETED - "):
-            self._rename_file(task_file_id, f"COMPLETED - {current_name}")
+        new_name = None if current_name.startswith("COMPLETED - ") else f"COMPLETED - {current_name}"
+        self._move_file(task_file_id, completed, current_parents=file.get("parents") or [], new_name=new_name)
 
         return True
 
@@ -412,7 +908,7 @@ class SimpleGoogleDrive:
             self._trash_file_or_folder(task_file_id)
             return True
         except Exception as e:
-            logger.error(f"Delete task failed: {e}")
+            logger.error("Delete task failed: %s", e)
             return False
 
     def _parse_task_filename(self, name: str) -> Dict:
@@ -448,15 +944,16 @@ class SimpleGoogleDrive:
         for status, folder in (("Pending", fids["ongoing"]), ("Completed", fids["completed"])):  # type: ignore
             page = None
             while True:
-                resp = self.drive.files().list(
+                resp = self._execute(self.drive.files().list(
                     q=(
                         f"'{folder}' in parents and "
                         "mimeType!='application/vnd.google-apps.folder' and trashed=false"
                     ),
                     fields="nextPageToken, files(id,name,createdTime,modifiedTime)",
                     pageToken=page,
+                    pageSize=1000,
                     orderBy="name_natural",
-                ).execute()
+                ))
                 for f in resp.get("files", []):
                     meta = self._parse_task_filename(f.get("name", ""))
                     out.append(
@@ -486,49 +983,43 @@ class SimpleGoogleDrive:
         return out
 
     def get_upcoming_tasks(self, days: int = 30) -> List[Dict]:
-        """Scan all clients' Ongoing Tasks and return those due within `days`."""
+        """
+        Scan all clients' Ongoing Tasks and return those due within `days`.
+        Folders are resolved level by level (Tasks, then Ongoing Tasks) and the task
+        files listed with combined parent queries, so the scan costs a handful of
+        calls rather than several per client. Read-only: missing folders mean no tasks.
+        """
         upcoming: List[Dict] = []
         clients = self.get_clients_enhanced()
         today = datetime.today().date()
         horizon = today + timedelta(days=days)
 
-        for c in clients:
-            client_id = c["client_id"]
-            fids = self._get_client_tasks_folder_ids(client_id)
-            ongoing = fids["ongoing"]
-            page = None
-            while True:
-                resp = self.drive.files().list(
-                    q=(
-                        f"'{ongoing}' in parents and "
-                        "mimeType!='application/vnd.google-apps.folder' and trashed=false"
-                    ),
-                    fields="nextPageToken, files(id,name,createdTime)",
-                    pageToken=page,
-                    orderBy="name_natural",
-                ).execute()
-                for f in resp.get("files", []):
-                    meta = self._parse_task_filename(f.get("name", ""))
-                    dd = _safe_date(meta.get("due_date", ""))
-                    if dd and today <= dd.date() <= horizon:
-                        upcoming.append(
-                            {
-                                "task_id": f.get("id"),
-                                "client_id": client_id,
-                                "title": meta.get("title", ""),
-                                "task_type": meta.get("task_type", ""),
-                                "due_date": meta.get("due_date", ""),
-                                "priority": meta.get("priority", "Medium"),
-                                "status": "Pending",
-                                "description": "",
-                                "created_date": f.get("createdTime", "")[:10],
-                                "completed_date": "",
-                                "time_spent": "",
-                            }
-                        )
-                page = resp.get("nextPageToken")
-                if not page:
-                    break
+        # parent-index: folder id -> owning client id
+        owner = {c.client_id: c.client_id for c in clients}
+        for level in ("Tasks", "Ongoing Tasks"):
+            found = self._list_folders_under(list(owner), level)
+            owner = {f["id"]: owner[p] for f in found for p in f.get("parents", []) if p in owner}
+
+        for f in self._list_files_under(list(owner), "id,name,createdTime,parents"):
+            client_id = next((owner[p] for p in f.get("parents", []) if p in owner), None)
+            meta = self._parse_task_filename(f.get("name", ""))
+            dd = _safe_date(meta.get("due_date", ""))
+            if client_id and dd and today <= dd.date() <= horizon:
+                upcoming.append(
+                    {
+                        "task_id": f.get("id"),
+                        "client_id": client_id,
+                        "title": meta.get("title", ""),
+                        "task_type": meta.get("task_type", ""),
+                        "due_date": meta.get("due_date", ""),
+                        "priority": meta.get("priority", "Medium"),
+                        "status": "Pending",
+                        "description": "",
+                        "created_date": f.get("createdTime", "")[:10],
+                        "completed_date": "",
+                        "time_spent": "",
+                    }
+                )
 
         upcoming.sort(key=lambda t: _safe_date(t["due_date"]) or datetime(1970, 1, 1))
         return upcoming
@@ -547,7 +1038,7 @@ class SimpleGoogleDrive:
             data = self._read_file_bytes(f["id"])
             return json.loads(data.decode("utf-8")) if data else default
         except Exception as e:
-            logger.warning(f"Failed to read {filename}: {e}")
+            logger.warning("Failed to read %s: %s", filename, e)
             return default
 
     def _write_json_in_folder(self, folder_id: str, filename: str, obj) -> str:
@@ -616,8 +1107,10 @@ class SimpleGoogleDrive:
     def get_total_assets(self) -> float:
         """Sum of all product values across all clients."""
         total = 0.0
-        for c in self.get_clients_enhanced():
-            for p in self.get_client_products(c["client_id"]):
+        # Each client costs ~3 dependent Drive calls; fetch clients concurrently on the pool
+        client_ids = [c.client_id for c in self.get_clients_enhanced()]
+        for products in _DRIVE_POOL.map(self.get_client_products, client_ids):
+            for p in products:
                 total += _float_safe(p.get("value", 0))
         return round(total, 2)
 
@@ -651,28 +1144,37 @@ class SimpleGoogleDrive:
             "Client Confirmation",
             "Emails",
         ]
-        created = {"review_year_id": yr_id}
-        for sf in subfolders:
-            created[sf] = self._ensure_folder(yr_id, sf)
-
-        agenda_val = created["Agenda & Valuation"]
+        # One listing, then a single batched create for the missing siblings
+        folders = {(f.get("name") or "").strip(): f["id"] for f in self._list_folders(yr_id)}
+        missing = [sf for sf in subfolders if sf not in folders]
+        if missing:
+            folders.update(self._create_folders_batch(yr_id, missing))
+
+        # Media uploads can't go in a batch request; run the two in parallel instead.
+        agenda_val = folders["Agenda & Valuation"]
         today_str = self._uk_date_str(datetime.today())
+        doc_futures = [
+            # Agenda doc
+            _DRIVE_POOL.submit(
+                self._upload_docx,
+                agenda_val,
+                f"Meeting Agenda – {display_name} – {year}.docx",
+                self._build_agenda_doc(display_name, today_str),
+            ),
+            # Valuation doc (styled similarly)
+            _DRIVE_POOL.submit(
+                self._upload_docx,
+                agenda_val,
+                f"Valuation Summary – {display_name} – {year}.docx",
+                self._build_valuation_doc(display_name, today_str),
+            ),
+        ]
 
-        # Agenda doc
-        agenda_doc = self._build_agenda_doc(display_name, today_str)
-        self._upload_docx(
-            agenda_val,
-            f"Meeting Agenda – {display_name} – {year}.docx",
-            agenda_doc,
-        )
-
-        # Valuation doc (styled similarly)
-        val_doc = self._build_valuation_doc(display_name, today_str)
-        self._upload_docx(
-            agenda_val,
-            f"Valuation Summary – {display_name} – {year}.docx",
-            val_doc,
-        )
+        created = {"review_year_id": yr_id}
+        for sf in subfolders:
+            created[sf] = folders[sf]
+        for fut in doc_futures:
+            fut.result()
 
         return created
 
@@ -686,7 +1188,7 @@ class SimpleGoogleDrive:
             resumable=False,
         )
         meta = {"name": filename, "parents": [parent_id]}
-        self.drive.files().create(body=meta, media_body=media, fields="id,name").execute()
+        self._execute(self.drive.files().create(body=meta, media_body=media, fields="id"))
 
     # -----------------------------
     # Word document builders (matching look)
@@ -735,3 +1237,30 @@ class SimpleGoogleDrive:
         doc.add_paragraph("")
         doc.add_paragraph("Total Value: £")
         return doc
+
+
+# -----------------------------
+# Session-scoped client reuse
+# -----------------------------
+def drive_for_session(credentials_info: Dict) -> SimpleGoogleDrive:
+    """
+    Return a SimpleGoogleDrive for the OAuth credentials stored in the session.
+
+    Clients are kept in a small per-thread LRU keyed by (client_id, refresh_token),
+    so repeat requests skip Credentials construction and service discovery and
+    reuse the thread's kept-alive connection pool. The cache is per thread
+    because httplib2 transports must not be shared across threads.
+    """
+    key = (credentials_info.get("client_id"), credentials_info.get("refresh_token") or credentials_info.get("token"))
+    cache = getattr(_thread_drives, "cache", None)
+    if cache is None:
+        cache = _thread_drives.cache = OrderedDict()
+    drive = cache.get(key)
+    if drive is not None:
+        cache.move_to_end(key)
+        return drive
+    drive = SimpleGoogleDrive(Credentials(**credentials_info))
+    cache[key] = drive
+    if len(cache) > _DRIVES_PER_THREAD:
+        cache.popitem(last=False)
+    return drive
@@ -8,32 +8,28 @@ FULL FILE — drop in as routes/client_details.py
 
 import io
 import json
+import hashlib
 import logging
 from typing import Dict, List, Optional
 
-from flask import Blueprint, render_template_string, redirect, url_for, session
-from google.oauth2.credentials import Credentials
+from flask import Blueprint, render_template, redirect, url_for, session, make_response
 from googleapiclient.http import MediaIoBaseDownload
 
-from models.google_drive import SimpleGoogleDrive
+from models.google_drive import SimpleGoogleDrive, DRIVE_RETRIES
+from routes.helpers import display_holding, etag_matches, get_drive, handle_drive_errors
 
 logger = logging.getLogger(__name__)
 client_details_bp = Blueprint("client_details", __name__)
 
-def _require_creds():
-    if "credentials" not in session:
-        return None
-    return Credentials(**session["credentials"])
-
 # Helpers copied (read-only) to fetch holdings.json
 def _find_child_folder(drive_service, parent_id: str, name: str) -> Optional[str]:
-    safe = (name or "").replace("'", "’")
+    safe = (name or "").replace("\\", "\\\\").replace("'", "\\'")  # Drive query string escaping
     q = (
         f"'{parent_id}' in parents and "
         "mimeType='application/vnd.google-apps.folder' and "
         f"name='{safe}' and trashed=false"
     )
-    resp = drive_service.files().list(q=q, fields="files(id,name)", pageSize=1).execute()
+    resp = drive_service.files().list(q=q, fields="files(id)", pageSize=1).execute(num_retries=DRIVE_RETRIES)
     files = resp.get("files", []) or []
     return files[0]["id"] if files else None
 
@@ -42,7 +38,7 @@ def _ensure_folder(drive_service, parent_id: str, name: str) -> str:
     if fid:
         return fid
     meta = {"name": name, "mimeType": "application/vnd.google-apps.folder", "parents": [parent_id]}
-    created = drive_service.files().create(body=meta, fields="id").execute()
+    created = drive_service.files().create(body=meta, fields="id").execute(num_retries=DRIVE_RETRIES)
     return created["id"]
 
 def _load_holdings(drive: SimpleGoogleDrive, client_id: str) -> List[Dict]:
@@ -55,7 +51,7 @@ def _load_holdings(drive: SimpleGoogleDrive, client_id: str) -> List[Dict]:
             "mimeType!='application/vnd.google-apps.folder' and "
             "name='holdings.json' and trashed=false"
         )
-        resp = service.files().list(q=q, fields="files(id,name)", pageSize=1).execute()
+        resp = service.files().list(q=q, fields="files(id)", pageSize=1).execute(num_retries=DRIVE_RETRIES)
         files = resp.get("files", []) or []
         if not files:
             return []
@@ -65,13 +61,13 @@ def _load_holdings(drive: SimpleGoogleDrive, client_id: str) -> List[Dict]:
         downloader = MediaIoBaseDownload(stream, req)
         done = False
         while not done:
-            _, done = downloader.next_chunk()
+            _, done = downloader.next_chunk(num_retries=DRIVE_RETRIES)
         stream.seek(0)
         content = stream.read().decode("utf-8")
         data = json.loads(content)
         return data if isinstance(data, list) else []
     except Exception as e:
-        logger.error(f"Details: failed to load holdings for {client_id}: {e}")
+        logger.error("Details: failed to load holdings for %s: %s", client_id, e)
         return []
 
 @client_details_bp.route("/clients/<client_id>/details")
@@ -81,114 +77,31 @@ def client_details(client_id):
     - Header + quick links (Profile, Tasks, Communications, Reviews, Portfolio, Google Folder)
     - Read-only snapshot of holdings with button to edit in Portfolio
     """
-    creds = _require_creds()
-    if not creds:
+    if not (creds := session.get("credentials")):
         return redirect(url_for("auth.authorize"))
 
-    try:
-        drive = SimpleGoogleDrive(creds)
-        clients = drive.get_clients_enhanced()
-        client = next((c for c in clients if c["client_id"] == client_id), None)
-        if not client:
-            return "Client not found", 404
-
-        holdings = _load_holdings(drive, client_id)
+    drive = get_drive(creds)
 
-        # Build Google Drive link for convenience (web view of client folder)
-        drive_link = f"https://drive.google.com/drive/folders/{client_id}"
+    # Nothing in Drive changed since the browser's copy -> skip listing + render
+    etag = hashlib.sha1(f"details:{client_id}:{drive.get_changes_token()}".encode()).hexdigest()
+    if etag_matches(etag):
+        return "", 304
 
-        return render_template_string(
-            """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>WealthPro CRM - {{ client.display_name }} Details</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-</head>
-<body class="bg-gray-50">
-    <nav class="bg-gradient-to-r from-slate-800 to-blue-600 text-white shadow">
-        <div class="max-w-7xl mx-auto px-6">
-            <div class="h-16 flex items-center justify-between">
-                <h1 class="text-lg font-bold">WealthPro CRM</h1>
-                <div class="flex gap-6">
-                    <a href="/" class="hover:text-blue-200">Dashboard</a>
-                    <a href="/clients" class="hover:text-blue-200">Clients</a>
-                    <a href="/tasks" class="hover:text-blue-200">Tasks</a>
-                </div>
-            </div>
-        </div>
-    </nav>
+    client = drive.get_client_by_id(client_id)
+    if not client:
+        return "Client not found", 404
 
-    <main class="max-w-7xl mx-auto px-6 py-8">
-        <div class="flex items-center justify-between mb-6">
-            <div>
-                <h2 class="text-2xl font-bold">{{ client.display_name }}</h2>
-                <p class="text-gray-600 text-sm mt-1">Client Details & Overview</p>
-            </div>
-            <a href="/clients" class="px-4 py-2 rounded bg-gray-700 text-white hover:bg-gray-800">Back to Clients</a>
-        </div>
+    holdings = [display_holding(h) for h in _load_holdings(drive, client_id)]
 
-        <!-- Quick Actions -->
-        <div class="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-6 gap-3 mb-8">
-            <a href="/clients/{{ client.client_id }}/profile" class="block text-center px-3 py-2 bg-white shadow rounded hover:bg-gray-50">Profile</a>
-            <a href="/clients/{{ client.client_id }}/tasks" class="block text-center px-3 py-2 bg-white shadow rounded hover:bg-gray-50">Tasks</a>
-            <a href="/clients/{{ client.client_id }}/communications" class="block text-center px-3 py-2 bg-white shadow rounded hover:bg-gray-50">Comms</a>
-            <a href="/reviews/{{ client.client_id }}" class="block text-center px-3 py-2 bg-white shadow rounded hover:bg-gray-50">Reviews</a>
-            <a href="/clients/{{ client.client_id }}/portfolio" class="block text-center px-3 py-2 bg-white shadow rounded hover:bg-gray-50">Portfolio</a>
-            <a href="{{ drive_link }}" target="_blank" class="block text-center px-3 py-2 bg-white shadow rounded hover:bg-gray-50">Google Folder</a>
-        </div>
+    resp = make_response(render_template(
+        "clients/details.html",
+        client=client,
+        holdings=holdings,
+    ))
+    resp.set_etag(etag)
+    # Always revalidate: the ETag makes that a cheap 304, and edits elsewhere show up at once
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
 
-        <!-- Portfolio Snapshot -->
-        <div class="bg-white shadow rounded-lg overflow-hidden">
-            <div class="px-6 py-4 border-b flex items-center justify-between">
-                <h3 class="font-semibold">Portfolio Snapshot</h3>
-                <a href="/clients/{{ client.client_id }}/portfolio" class="text-blue-600 hover:underline">Edit in Portfolio</a>
-            </div>
-            <div class="p-6">
-                {% if holdings %}
-                <div class="overflow-x-auto">
-                    <table class="min-w-full text-sm">
-                        <thead class="bg-gray-50">
-                            <tr>
-                                <th class="px-3 py-2 text-left font-medium text-gray-600">Type</th>
-                                <th class="px-3 py-2 text-left font-medium text-gray-600">Provider</th>
-                                <th class="px-3 py-2 text-left font-medium text-gray-600">Account</th>
-                                <th class="px-3 py-2 text-left font-medium text-gray-600">Value</th>
-                                <th class="px-3 py-2 text-left font-medium text-gray-600">Currency</th>
-                            </tr>
-                        </thead>
-                        <tbody class="divide-y">
-                            {% for h in holdings %}
-                            <tr>
-                                <td class="px-3 py-2">{{ h.product_type or '' }}</td>
-                                <td class="px-3 py-2">{{ h.provider or '' }}</td>
-                                <td class="px-3 py-2">
-                                    <div class="font-medium">{{ h.account_name or '' }}</div>
-                                    <div class="text-gray-500">{{ h.account_number or '' }}</div>
-                                </td>
-                                <td class="px-3 py-2">
-                                    {% set v = (h.value or 0) | float %}
-                                    £{{ '{:,.2f}'.format(v) if (h.currency in ['', None, 'GBP']) else '{:,.2f}'.format(v) }}
-                                </td>
-                                <td class="px-3 py-2">{{ h.currency or 'GBP' }}</td>
-                            </tr>
-                            {% endfor %}
-                        </tbody>
-                    </table>
-                </div>
-                {% else %}
-                    <p class="text-gray-500">No holdings recorded yet. Click “Edit in Portfolio” to add them.</p>
-                {% endif %}
-            </div>
-        </div>
-    </main>
-</body>
-</html>
-            """,
-            client=client,
-            holdings=holdings,
-            drive_link=drive_link,
-        )
-    except Exception as e:
-        logger.exception("Client details error")
-        return f"Error: {e}", 500
+handle_drive_errors(client_details_bp)
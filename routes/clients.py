@@ -1,23 +1,38 @@
 # routes/clients.py
-from flask import Blueprint, render_template, url_for, request
+from flask import Blueprint, render_template, url_for, make_response
+
+from routes.helpers import etag_matches
 
 bp = Blueprint("clients", __name__, url_prefix="/clients")
 
+# Placeholder data; hook up to your DB later. Keep the id index in step with the list.
+_CLIENTS = [
+    {"id": 1, "name": "Jane Doe"},
+    {"id": 2, "name": "John Smith"},
+]
+_CLIENTS_BY_ID = {c["id"]: c for c in _CLIENTS}
+
+def _find(client_id):
+    return _CLIENTS_BY_ID.get(client_id)
+
 @bp.route("/", methods=["GET"])
 def list_clients():
-    # Placeholder list view; hook up to your DB later
-    sample_clients = [
-        {"id": 1, "name": "Jane Doe"},
-        {"id": 2, "name": "John Smith"},
-    ]
-    return render_template(
+    resp = make_response(render_template(
         "simple_page.html",
         title="Clients",
         heading="Clients",
         description="Basic client list (placeholder).",
         back_url=url_for("auth.dashboard"),
-        extra={"clients": sample_clients},
-    )
+        extra={"clients": _CLIENTS},
+    ))
+    # Rapid re-loads reuse the last render; after that, revalidate by ETag (304 if unchanged)
+    resp.cache_control.private = True
+    resp.cache_control.max_age = 15
+    resp.add_etag()
+    if etag_matches(resp.get_etag()[0]):
+        resp.status_code = 304
+        resp.set_data(b"")
+    return resp
 
 @bp.route("/<int:client_id>", methods=["GET"])
 def client_details(client_id):
@@ -28,10 +43,12 @@ def client_details(client_id):
         {"label": "Reviews", "href": url_for("reviews.list_reviews", client_id=client_id)},
         {"label": "Files", "href": url_for("files.client_files", client_id=client_id)},
     ]
+    client = _find(client_id)
+    name = client["name"] if client else f"Client #{client_id}"
     return render_template(
         "simple_page.html",
-        title=f"Client #{client_id}",
-        heading=f"Client #{client_id} details",
+        title=name,
+        heading=f"{name} details",
         description="Client overview (placeholder). Use the links below.",
         back_url=url_for("clients.list_clients"),
         extra={"links": links},
@@ -16,148 +16,38 @@ private helpers (_ensure_folder, _upload_bytes). No changes to the model are req
 """
 
 import io
+import hashlib
+import heapq
+import itertools
 import logging
 from datetime import datetime
-from flask import Blueprint, render_template_string, request, redirect, url_for, session
-from google.oauth2.credentials import Credentials
+from typing import Optional, Tuple
+from flask import Blueprint, make_response, render_template, request, redirect, url_for, session, current_app
 from googleapiclient.http import MediaIoBaseUpload
-from models.google_drive import SimpleGoogleDrive
+from models.google_drive import SimpleGoogleDrive, DRIVE_RETRIES
+from routes.helpers import etag_matches, get_drive, handle_drive_errors
 
 logger = logging.getLogger(__name__)
 communications_bp = Blueprint("communications", __name__)
 
+_NOTES_PER_PAGE = 50
 
-def _require_creds():
-    if "credentials" not in session:
-        return None
-    return Credentials(**session["credentials"])
-
-
-def _ensure_comm_folder(drive: SimpleGoogleDrive, client_folder_id: str) -> str:
-    """Ensure the Communications folder exists under the client folder and return its id."""
-    return drive._ensure_folder(client_folder_id, "Communications")  # noqa: SLF001 (accessing private helper by design)
-
-
-def _list_comm_files(drive: SimpleGoogleDrive, comm_folder_id: str):
-    """List non-folder files (notes) in the Communications folder, newest first."""
-    files = []
-    page = None
-    service = drive.drive  # googleapiclient service
-    while True:
-        resp = service.files().list(
-            q=f"'{comm_folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false",
-            fields="nextPageToken, files(id,name,modifiedTime,createdTime,webViewLink,size,mimeType)",
-            orderBy="modifiedTime desc",
-            pageToken=page,
-            pageSize=100,
-        ).execute()
-        files.extend(resp.get("files", []))
-        page = resp.get("nextPageToken")
-        if not page:
-            break
-    return files
-
-
-def _create_comm_note(drive: SimpleGoogleDrive, comm_folder_id: str, payload: dict) -> str:
-    """
-    Create a .txt communication note in the Communications folder.
-    Filename example: '2025-08-17 14-30 - Phone Call - Subject [COM20250817143055].txt'
-    """
-    ts = datetime.now().strftime("%Y%m%d%H%M%S")
-    date = (payload.get("date") or datetime.now().strftime("%Y-%m-%d")).strip()
-    time_ = (payload.get("time") or "").replace(":", "-").strip()
-    ctype = (payload.get("type") or "Note").strip()
-    subj = (payload.get("subject") or "No Subject").strip()
+# COM id suffix: two notes posted in the same second would otherwise share an id
+_COMM_SEQ = itertools.count()
 
-    base = f"{date}"
-    if time_:
-        base += f" {time_}"
-    filename = f"{base} - {ctype} - {subj} [COM{ts}].txt"
+# /communications/summary: top N notes overall, at most M per client
+_SUMMARY_LIMIT = 20
+_SUMMARY_PER_CLIENT = 5
+_SUMMARY_FOLDERS_PER_QUERY = 40  # keeps the combined 'in parents' query well under Drive's length limit
 
-    lines = [
-        f"Communication ID: COM{ts}",
-        f"Date: {payload.get('date', '')}",
-        f"Time: {payload.get('time', '')}",
-        f"Type: {ctype}",
-        f"Subject: {subj}",
-        f"Duration: {payload.get('duration','')}",
-        f"Outcome: {payload.get('outcome','')}",
-        f"Follow Up Required: {payload.get('follow_up_required','No')}",
-        f"Follow Up Date: {payload.get('follow_up_date','')}",
-        f"Created By: {payload.get('created_by','')}",
-        "",
-        "Details:",
-        (payload.get("details") or "").strip(),
-    ]
-    data = ("\n".join(lines)).encode("utf-8")
-    return drive._upload_bytes(comm_folder_id, filename, data, "text/plain")  # noqa: SLF001
-
-
-@communications_bp.route("/clients/<client_id>/communications", methods=["GET", "POST"])
-def client_communications(client_id):
-    """Per-client communications page (Drive-only)."""
-    creds = _require_creds()
-    if not creds:
-        return redirect(url_for("auth.authorize"))
-
-    try:
-        drive = SimpleGoogleDrive(creds)
-
-        # Find the client folder first
-        clients = drive.get_clients_enhanced()
-        client = next((c for c in clients if c["client_id"] == client_id), None)
-        if not client:
-            return "Client not found", 404
-
-        client_folder_id = client.get("folder_id") or client.get("client_id")
-        comm_folder_id = _ensure_comm_folder(drive, client_folder_id)
-
-        if request.method == "POST":
-            comm_data = {
-                "date": request.form.get("date", datetime.now().strftime("%Y-%m-%d")),
-                "time": request.form.get("time", ""),
-                "type": request.form.get("type", ""),
-                "subject": request.form.get("subject", ""),
-                "details": request.form.get("details", ""),
-                "outcome": request.form.get("outcome", ""),
-                "duration": request.form.get("duration", ""),
-                "follow_up_required": request.form.get("follow_up_required", "No"),
-                "follow_up_date": request.form.get("follow_up_date", ""),
-                "created_by": "System User",
-            }
-            _ = _create_comm_note(drive, comm_folder_id, comm_data)
-            return redirect(url_for("communications.client_communications", client_id=client_id))
-
-        # GET: list recent communications (files in Communications/)
-        notes = _list_comm_files(drive, comm_folder_id)
-
-        return render_template_string(
-            """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>WealthPro CRM - Communications</title>
-    <script src="https://cdn.tailwindcss.com"></script>
+_CLIENT_TEMPLATE = """{% extends "base.html" %}
+{% block title %}WealthPro CRM - Communications{% endblock %}
+{% block head %}
     <style>
         body { font-family: "Inter", sans-serif; }
-        .gradient-wealth { background: linear-gradient(135deg, #1a365d 0%, #2563eb 100%); }
     </style>
-</head>
-<body class="bg-gray-50">
-    <nav class="gradient-wealth text-white shadow-lg">
-        <div class="max-w-7xl mx-auto px-6">
-            <div class="flex justify-between items-center h-16">
-                <h1 class="text-xl font-bold">WealthPro CRM</h1>
-                <div class="flex items-center space-x-6">
-                    <a href="/" class="hover:text-blue-200">Dashboard</a>
-                    <a href="/clients" class="hover:text-blue-200">Clients</a>
-                    <a href="/tasks" class="hover:text-blue-200">Tasks</a>
-                </div>
-            </div>
-        </div>
-    </nav>
-
-    <main class="max-w-7xl mx-auto px-6 py-8">
+{% endblock %}
+{% block content %}
         <div class="mb-8">
             <h1 class="text-3xl font-bold">Communications: {{ client.display_name }}</h1>
             <p class="text-gray-600 mt-2">Notes are stored in Google Drive → Communications</p>
@@ -259,6 +149,12 @@ def client_communications(client_id):
                         {% else %}
                             <p class="text-gray-500 text-center py-8">No communications recorded yet.</p>
                         {% endif %}
+                        {% if page_token or next_page %}
+                            <div class="flex justify-between mt-6 text-sm">
+                                {% if page_token %}<a href="?" class="text-blue-600 hover:text-blue-800">&larr; Newest</a>{% else %}<span></span>{% endif %}
+                                {% if next_page %}<a href="?page={{ next_page | urlencode }}" class="text-blue-600 hover:text-blue-800">Older &rarr;</a>{% endif %}
+                            </div>
+                        {% endif %}
                     </div>
                 </div>
 
@@ -267,74 +163,20 @@ def client_communications(client_id):
                 </div>
             </div>
         </div>
-    </main>
-</body>
-</html>
-            """,
-            client=client,
-            notes=notes,
-            now_date=datetime.now().strftime("%Y-%m-%d"),
-        )
-    except Exception as e:
-        logger.exception("Client communications error")
-        return f"Error: {e}", 500
-
-
-@communications_bp.route("/communications/summary")
-def communications_summary():
-    """Overview of the most recent communications across all clients (Drive-only)."""
-    creds = _require_creds()
-    if not creds:
-        return redirect(url_for("auth.authorize"))
+{% endblock %}
+{% block body_end %}
+    {% if next_page %}<link rel="prefetch" href="?page={{ next_page | urlencode }}">{% endif %}
+{% endblock %}
+"""
 
-    try:
-        drive = SimpleGoogleDrive(creds)
-        clients = drive.get_clients_enhanced()
-
-        recent = []
-        for c in clients:
-            client_folder_id = c.get("folder_id") or c.get("client_id")
-            comm_folder_id = drive._ensure_folder(client_folder_id, "Communications")  # noqa: SLF001
-            files = _list_comm_files(drive, comm_folder_id)
-            for f in files[:5]:  # only the latest 5 per client
-                recent.append({
-                    "id": f.get("id"),
-                    "name": f.get("name"),
-                    "modifiedTime": f.get("modifiedTime"),
-                    "client_name": c.get("display_name"),
-                })
-
-        # Sort by modifiedTime desc
-        recent.sort(key=lambda x: x.get("modifiedTime", ""), reverse=True)
-        recent = recent[:20]  # top 20 overall
-
-        return render_template_string(
-            """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>WealthPro CRM - Communications Summary</title>
-    <script src="https://cdn.tailwindcss.com"></script>
+_SUMMARY_TEMPLATE = """{% extends "base.html" %}
+{% block title %}WealthPro CRM - Communications Summary{% endblock %}
+{% block head %}
     <style>
         body { font-family: "Inter", sans-serif; }
-        .gradient-wealth { background: linear-gradient(135deg, #1a365d 0%, #2563eb 100%); }
     </style>
-</head>
-<body class="bg-gray-50">
-    <nav class="gradient-wealth text-white shadow-lg">
-        <div class="max-w-7xl mx-auto px-6">
-            <div class="flex justify-between items-center h-16">
-                <h1 class="text-xl font-bold">WealthPro CRM</h1>
-                <div class="flex items-center space-x-6">
-                    <a href="/" class="hover:text-blue-200">Dashboard</a>
-                    <a href="/clients" class="hover:text-blue-200">Clients</a>
-                    <a href="/tasks" class="hover:text-blue-200">Tasks</a>
-                </div>
-            </div>
-        </div>
-    </nav>
-
-    <main class="max-w-7xl mx-auto px-6 py-8">
+{% endblock %}
+{% block content %}
         <div class="mb-8">
             <h1 class="text-3xl font-bold">Recent Communications</h1>
             <p class="text-gray-600 mt-2">Across all clients (latest 20)</p>
@@ -366,12 +208,252 @@ def communications_summary():
                 {% endif %}
             </div>
         </div>
-    </main>
-</body>
-</html>
-            """,
-            recent=recent,
-        )
-    except Exception as e:
-        logger.exception("Communications summary error")
-        return f"Error: {e}", 500
+{% endblock %}
+"""
+
+@communications_bp.record_once
+def _compile_templates(state):
+    """Compile the inline pages once per app (in that app's Jinja env) at registration."""
+    env = state.app.jinja_env
+    state.app.extensions["communications_templates"] = {
+        "client": env.from_string(_CLIENT_TEMPLATE),
+        "summary": env.from_string(_SUMMARY_TEMPLATE),
+    }
+
+
+def _template(name: str):
+    """Precompiled Template for this app; render_template() accepts Template objects."""
+    return current_app.extensions["communications_templates"][name]
+
+
+def _ensure_comm_folder(drive: SimpleGoogleDrive, client_folder_id: str) -> str:
+    """Ensure the Communications folder exists under the client folder and return its id."""
+    return drive._ensure_folder(client_folder_id, "Communications")  # noqa: SLF001 (accessing private helper by design)
+
+
+def _find_comm_folder(drive: SimpleGoogleDrive, client_folder_id: str) -> Optional[str]:
+    """Id of the client's Communications folder, or None if it hasn't been created yet (never creates it)."""
+    cached = drive._cached_folder_id(client_folder_id, "Communications")  # noqa: SLF001
+    if cached:
+        return cached
+    found = drive._find_child_folder(client_folder_id, "Communications")  # noqa: SLF001
+    if not found:
+        return None
+    drive._cache_folder_id(client_folder_id, "Communications", found["id"])  # noqa: SLF001
+    return found["id"]
+
+
+def _list_comm_files(drive: SimpleGoogleDrive, comm_folder_id: str, page_size: int = _NOTES_PER_PAGE, page_token=None):
+    """
+    One page of non-folder files (notes) in the Communications folder, newest first.
+    Returns (files, next_page_token); the token is None on the last page.
+    """
+    service = drive.drive  # googleapiclient service
+    resp = service.files().list(
+        q=f"'{comm_folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false",
+        fields="nextPageToken, files(id,name,modifiedTime,createdTime)",  # what the page renders
+        orderBy="modifiedTime desc",
+        pageToken=page_token,
+        pageSize=page_size,
+    ).execute(num_retries=DRIVE_RETRIES)
+    return resp.get("files", []), resp.get("nextPageToken")
+
+
+def _iter_recent_notes(drive: SimpleGoogleDrive, folder_ids: list, client_of: dict):
+    """
+    Notes across a group of Communications folders, newest first, at most
+    _SUMMARY_PER_CLIENT per folder; pages are only fetched while the caller
+    keeps iterating.
+
+    Once a folder is full it is dropped from the query, which restarts at the
+    last modifiedTime seen. Otherwise one busy client would have us page
+    through its whole history just to reach the next client's notes; this way
+    every extra page either yields notes or retires at least one folder.
+    """
+    active = list(folder_ids)
+    per_folder: dict = {}
+    seen: set = set()
+    before = token = None
+    while active:
+        q = " or ".join(f"'{fid}' in parents" for fid in active)
+        q = f"({q}) and mimeType!='application/vnd.google-apps.folder' and trashed=false"
+        if before:
+            q += f" and modifiedTime <= '{before}'"  # ties re-listed; `seen` skips them
+        resp = drive.drive.files().list(
+            q=q,
+            fields="nextPageToken, files(id,name,modifiedTime,parents)",
+            orderBy="modifiedTime desc",
+            pageSize=100,
+            pageToken=token,
+        ).execute(num_retries=DRIVE_RETRIES)
+        files = resp.get("files", [])
+        for f in files:
+            if f["id"] in seen:
+                continue
+            seen.add(f["id"])
+            folder_id = next((p for p in f.get("parents", []) if p in client_of), None)
+            if per_folder.get(folder_id, 0) >= _SUMMARY_PER_CLIENT:
+                continue
+            per_folder[folder_id] = per_folder.get(folder_id, 0) + 1
+            yield {
+                "id": f.get("id"),
+                "name": f.get("name"),
+                "modifiedTime": f.get("modifiedTime"),
+                "client_name": client_of.get(folder_id),
+            }
+        token = resp.get("nextPageToken")
+        if not token:
+            return
+        still_open = [fid for fid in active if per_folder.get(fid, 0) < _SUMMARY_PER_CLIENT]
+        if len(still_open) < len(active):
+            active, before, token = still_open, files[-1].get("modifiedTime"), None
+
+
+def _build_comm_note(payload: dict, now: datetime) -> Tuple[str, bytes]:
+    """
+    Filename and .txt body for a communication note created at `now`.
+    Filename example: '2025-08-17 14-30 - Phone Call - Subject [COM202508171430550007].txt'
+    """
+    ts = f"{now:%Y%m%d%H%M%S}{next(_COMM_SEQ) % 10000:04d}"
+    date = (payload.get("date") or f"{now:%Y-%m-%d}").strip()
+    time_ = (payload.get("time") or "").replace(":", "-").strip()
+    ctype = (payload.get("type") or "Note").strip()
+    subj = (payload.get("subject") or "No Subject").strip()
+
+    base = f"{date}"
+    if time_:
+        base += f" {time_}"
+    filename = f"{base} - {ctype} - {subj} [COM{ts}].txt"
+
+    lines = [
+        f"Communication ID: COM{ts}",
+        f"Date: {payload.get('date', '')}",
+        f"Time: {payload.get('time', '')}",
+        f"Type: {ctype}",
+        f"Subject: {subj}",
+        f"Duration: {payload.get('duration','')}",
+        f"Outcome: {payload.get('outcome','')}",
+        f"Follow Up Required: {payload.get('follow_up_required','No')}",
+        f"Follow Up Date: {payload.get('follow_up_date','')}",
+        f"Created By: {payload.get('created_by','')}",
+        "",
+        "Details:",
+        (payload.get("details") or "").strip(),
+    ]
+    data = ("\n".join(lines)).encode("utf-8")
+    return filename, data
+
+
+def _create_comm_note(drive: SimpleGoogleDrive, comm_folder_id: str, payload: dict, now: datetime) -> str:
+    """
+    Upload the note and return its file id. Synchronous on purpose: the POST's
+    redirect must land on a page that already lists the note (read-your-writes),
+    and a failed upload surfaces as an error instead of a silently lost note.
+    """
+    filename, data = _build_comm_note(payload, now)
+    return drive._upload_bytes(comm_folder_id, filename, data, "text/plain")  # noqa: SLF001
+
+
+@communications_bp.route("/clients/<client_id>/communications", methods=["GET", "POST"])
+def client_communications(client_id):
+    """Per-client communications page (Drive-only)."""
+    if not (creds := session.get("credentials")):
+        return redirect(url_for("auth.authorize"))
+
+    drive = get_drive(creds)
+
+    # Find the client folder first (index lookup, or one files.get when the index is cold)
+    client = drive.get_client_by_id(client_id)
+    if not client:
+        return "Client not found", 404
+
+    client_folder_id = client.get("folder_id") or client.get("client_id")
+    now = datetime.now()
+    today = f"{now:%Y-%m-%d}"
+
+    if request.method == "POST":
+        form = request.form.to_dict()  # one MultiDict walk, then plain dict lookups
+        comm_data = {
+            "date": form.get("date", today),
+            "time": form.get("time", ""),
+            "type": form.get("type", ""),
+            "subject": form.get("subject", ""),
+            "details": form.get("details", ""),
+            "outcome": form.get("outcome", ""),
+            "duration": form.get("duration", ""),
+            "follow_up_required": form.get("follow_up_required", "No"),
+            "follow_up_date": form.get("follow_up_date", ""),
+            "created_by": "System User",
+        }
+        _create_comm_note(drive, _ensure_comm_folder(drive, client_folder_id), comm_data, now)
+        return redirect(url_for("communications.client_communications", client_id=client_id), code=303)
+
+    # GET: one page of recent communications (files in Communications/)
+    page_token = request.args.get("page") or None
+
+    # No Drive changes since the browser's copy of this page -> 304
+    etag = hashlib.sha1(f"{client_id}:{page_token}:{drive.get_changes_token()}".encode()).hexdigest()
+    if etag_matches(etag):
+        return "", 304
+
+    # A GET never creates the folder; until the first note is saved the list is just empty
+    comm_folder_id = _find_comm_folder(drive, client_folder_id)
+    notes, next_page = [], None
+    if comm_folder_id:
+        notes, next_page = _list_comm_files(drive, comm_folder_id, page_token=page_token)
+
+    resp = make_response(render_template(
+        _template("client"),
+        client=client,
+        notes=notes,
+        page_token=page_token,
+        next_page=next_page,
+        now_date=today,
+    ))
+    resp.set_etag(etag)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
+
+
+@communications_bp.route("/communications/summary")
+def communications_summary():
+    """Overview of the most recent communications across all clients (Drive-only)."""
+    if not (creds := session.get("credentials")):
+        return redirect(url_for("auth.authorize"))
+
+    drive = get_drive(creds)
+
+    # Nothing changed in Drive since the browser's copy of the summary -> 304, no listings
+    etag = hashlib.sha1(f"summary:{drive.get_changes_token()}".encode()).hexdigest()
+    if etag_matches(etag):
+        return "", 304
+
+    clients = drive.get_clients_enhanced()
+    names = {c.folder_id: c.display_name for c in clients}
+
+    # Every client's Communications folder in one combined query (read-only: none are created)
+    comm_folders = drive._list_folders_under(list(names), "Communications")  # noqa: SLF001
+
+    # ...then the newest notes across those folders: one modifiedTime-ordered query per
+    # group of folders (a batch would still cost one request per client). Each group is
+    # already newest-first, so merge them lazily and stop after the top 20.
+    client_of = {f["id"]: names.get((f.get("parents") or [None])[0]) for f in comm_folders}
+    folder_ids = list(client_of)
+    groups = [
+        _iter_recent_notes(drive, folder_ids[i:i + _SUMMARY_FOLDERS_PER_QUERY], client_of)
+        for i in range(0, len(folder_ids), _SUMMARY_FOLDERS_PER_QUERY)
+    ]
+    newest = heapq.merge(*groups, key=lambda x: x.get("modifiedTime", ""), reverse=True)
+    recent = list(itertools.islice(newest, _SUMMARY_LIMIT))
+
+    resp = make_response(render_template(
+        _template("summary"),
+        recent=recent,
+    ))
+    resp.set_etag(etag)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
+
+handle_drive_errors(communications_bp)
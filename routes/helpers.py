@@ -0,0 +1,86 @@
+# routes/helpers.py
+"""
+Small helpers shared by the route modules: the per-request Drive client, the
+Drive error page, conditional-GET checks and holding display values.
+"""
+
+import logging
+import math
+from typing import Dict, Optional
+
+from flask import Blueprint, g, request
+from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
+
+from models.google_drive import SimpleGoogleDrive, drive_for_session
+
+# Flask-Compress tags compressed responses' ETags as "<etag>:<algorithm>"
+_COMPRESS_SUFFIXES = (":br", ":gzip", ":deflate")
+
+DRIVE_ERROR_MESSAGE = "Google Drive request failed. Please try again."
+
+
+def get_drive(creds_info: dict) -> SimpleGoogleDrive:
+    """Drive client for this request; built only when a Drive call is imminent."""
+    if "drive" not in g:
+        g.drive = drive_for_session(creds_info)
+        g.drive.begin_request()
+    return g.drive
+
+
+def handle_drive_errors(bp: Blueprint) -> None:
+    """Answer Drive API / OAuth refresh failures raised inside `bp` with a logged 502."""
+    log = logging.getLogger(bp.import_name)
+
+    def drive_error(e):
+        log.exception("%s: Drive error", bp.name)
+        return DRIVE_ERROR_MESSAGE, 502
+
+    bp.register_error_handler(HttpError, drive_error)
+    bp.register_error_handler(RefreshError, drive_error)
+
+
+def _strip_compress_suffix(tag: str) -> str:
+    for suffix in _COMPRESS_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def etag_matches(etag: str) -> bool:
+    """
+    True if the request's If-None-Match names `etag`, either as sent or in the
+    compressed variant ("<etag>:br" / "<etag>:gzip") Flask-Compress handed out.
+    """
+    tags = request.if_none_match
+    if tags.star_tag:
+        return True
+    return any(_strip_compress_suffix(t) == etag for t in tags.as_set(include_weak=True))
+
+
+def fmt_currency(value):
+    """GBP display string ("£1,234.50"); non-numeric values pass through unchanged."""
+    try:
+        return f"£{float(value):,.2f}"
+    except (TypeError, ValueError):
+        return value
+
+
+def _holding_value(raw) -> Optional[float]:
+    """A stored holding value as a finite number, or None if it is missing or malformed."""
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def display_holding(h: Dict) -> Dict:
+    """Fill display defaults and the formatted value up front; the row markup then has no fallbacks."""
+    for key in ("product_type", "provider", "account_name", "account_number", "underlying", "notes"):
+        h[key] = h.get(key) or ""
+    h["currency"] = h.get("currency") or "GBP"
+    value = _holding_value(h.get("value"))
+    h["value_display"] = fmt_currency(value or 0)
+    h["value_input"] = h["value"] if value else ""  # as stored; blank rather than 0 or junk
+    return h
@@ -37,8 +37,11 @@ def list_products():
 @bp.route("/client/<int:client_id>", methods=["GET"])
 def client_products(client_id):
     items = _sample_products(client_id)
-    total_value = round(sum(p["value"] for p in items), 2)
-    total_fees  = round(sum(p["annual_fee"] for p in items), 2)
+    total_value = total_fees = 0.0
+    for p in items:  # one pass for both totals
+        total_value += p["value"]
+        total_fees += p["annual_fee"]
+    total_value, total_fees = round(total_value, 2), round(total_fees, 2)
 
     return render_template(
         "simple_page.html",
@@ -0,0 +1,9 @@
+// tailwind.config.js
+// Build the stylesheet the templates link to (run at deploy time, output is not committed):
+//   npx tailwindcss -i assets/tailwind.css -o static/tailwind.css --minify
+// Until static/tailwind.css exists the pages fall back to the Tailwind CDN script.
+module.exports = {
+  content: ["./templates/**/*.html", "./routes/**/*.py", "./models/**/*.py"],
+  theme: { extend: {} },
+  plugins: [],
+};